@@ -1,11 +1,18 @@
 import logging
 import json
+import re
 import urllib.parse
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 import asyncio
 import sys
+import time
 import platform
-from difflib import SequenceMatcher
+from dataclasses import dataclass, asdict
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
 
 # Configure logging
 logging.basicConfig(
@@ -20,151 +27,451 @@ if platform.system() == "Windows":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
     logger.info("Applied WindowsProactorEventLoopPolicy for asyncio compatibility")
 
-def calculate_similarity(a, b):
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+ISSUU_URL = "https://issuu.com/"
+SEARCH_URL = f"{ISSUU_URL}search?q="
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
 
-async def scrape_issuu_results(company_name):
-    # Generate URL by encoding the company name
-    base_url = "https://issuu.com/search?q="
-    encoded_company = urllib.parse.quote(company_name)
-    url = f"{base_url}{encoded_company}"
+# Characters dropped when comparing company names with author slugs
+DOMAIN_STRIP_TABLE = str.maketrans('', '', ' .')
+
+# Publication card selectors (shared by the static HTML parser and the Playwright extractor)
+PRICE_SELECTOR = '.PublicationCard__publication-card__price__SATkI__0-0-3199'
+TITLE_SELECTOR = 'h3.PublicationCard__publication-card__card-title__jufAN__0-0-3199'
+AUTHOR_LINK_SELECTOR = 'a.PublicationCard__publication-card__author-link__-bT0k__0-0-3199'
+CARD_SELECTOR = f'li:has({PRICE_SELECTOR})'
+
+# Resource types the extraction never needs
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+# Resolves once two consecutive polls see the same non-zero number of cards
+CARD_COUNT_STABLE_JS = """
+    (cardSelector) => {
+        const count = document.querySelectorAll(cardSelector).length;
+        const stable = count > 0 && window.__issuuCardCount === count;
+        window.__issuuCardCount = count;
+        return stable;
+    }
+"""
+
+# Runs over the matched cards with the selectors passed in, so the card query isn't repeated in the page
+EXTRACT_CARDS_JS = """
+    (items, [titleSelector, authorSelector, priceSelector]) => {
+        const data = [];
+        items.forEach(item => {
+            const titleElement = item.querySelector(titleSelector);
+            const title = titleElement?.innerText.trim();
+            const authorLink = item.querySelector(authorSelector)?.getAttribute('href');
+            const price = item.querySelector(priceSelector)?.innerText.trim();
+            const publicationLinkElement = titleElement?.closest('a') || item.querySelector(`a:has(${titleSelector})`);
+            const publicationLink = publicationLinkElement?.getAttribute('href');
+            if (title && authorLink && price && publicationLink) {
+                data.push({
+                    title,
+                    author_link: `https://issuu.com/${authorLink}`,
+                    price,
+                    publication_link: publicationLink.startsWith('https://') ? publicationLink : `https://issuu.com/${publicationLink}`
+                });
+            }
+        });
+        return data;
+    }
+"""
+
+# Next.js page data embedded in the search page
+NEXT_DATA_PATTERN = re.compile(r'<script id="__NEXT_DATA__"[^>]*>(.+?)</script>', re.S)
+
+@dataclass(slots=True, frozen=True)
+class Publication:
+    title: str
+    author_link: str
+    price: str
+    publication_link: str
+
+async def init_playwright(headless=True):
+    # Start Playwright and launch Chromium; the caller owns both and closes them with close_playwright.
+    # Pass headless=False to watch the browser while debugging
+    playwright = await async_playwright().start()
+    logger.info(f"Attempting to launch Chromium browser (headless={headless})")
+    try:
+        browser = await playwright.chromium.launch(headless=headless)
+    except Exception as e:
+        logger.error(f"Failed to launch browser: {str(e)}")
+        await playwright.stop()
+        raise
     
+    logger.info("Browser launched successfully")
+    return playwright, browser
+
+async def close_playwright(playwright, browser):
+    logger.info("Closing browser")
+    await browser.close()
+    await playwright.stop()
+
+def build_search_url(company_name):
+    # Generate URL by encoding the company name
+    url = f"{SEARCH_URL}{urllib.parse.quote(company_name)}"
     logger.info(f"Generated URL for company '{company_name}': {url}")
+    return url
+
+def parse_next_data(next_data):
+    # Read the publications from the Next.js page data; returns None when it doesn't have the shape we expect
+    # or yields no results, since the list may only be filled in client-side
+    try:
+        documents = json.loads(next_data)['props']['pageProps']['searchResults']['documents']
+    except (ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(documents, list):
+        return None
     
+    results = []
+    for document in documents:
+        if not isinstance(document, dict):
+            continue
+        # Like the card selectors, only priced publications are kept
+        title = document.get('title')
+        author = document.get('ownerUsername')
+        price = document.get('price')
+        publication_link = document.get('url')
+        if not all(isinstance(value, str) for value in (title, author, publication_link)):
+            continue
+        if not isinstance(price, (str, int, float)):
+            continue
+        if title.strip() and author and price and publication_link:
+            results.append({
+                'title': title.strip(),
+                'author_link': f"https://issuu.com/{author}",
+                'price': str(price).strip(),
+                'publication_link': publication_link if publication_link.startswith('https://') else f"https://issuu.com/{publication_link}"
+            })
+    if not results:
+        if documents:
+            logger.info("Page data documents didn't have the expected fields")
+        else:
+            logger.info("Page data has no documents, falling back to the result cards")
+        return None
+    return results
+
+def parse_search_html(html):
+    # Mirrors the Playwright extractor so both paths yield identical result dicts
+    tree = LexborHTMLParser(html)
+    results = []
+    for item in tree.css(CARD_SELECTOR):
+        title_element = item.css_first(TITLE_SELECTOR)
+        title = title_element.text().strip() if title_element is not None else None
+        author_element = item.css_first(AUTHOR_LINK_SELECTOR)
+        author_link = author_element.attributes.get('href') if author_element is not None else None
+        price = item.css_first(PRICE_SELECTOR).text().strip()
+        publication_link_element = title_element
+        while publication_link_element is not None and publication_link_element.tag != 'a':
+            publication_link_element = publication_link_element.parent
+        if publication_link_element is None:
+            publication_link_element = item.css_first(f'a:has({TITLE_SELECTOR})')
+        publication_link = publication_link_element.attributes.get('href') if publication_link_element is not None else None
+        if title and author_link and price and publication_link:
+            results.append({
+                'title': title,
+                'author_link': f"https://issuu.com/{author_link}",
+                'price': price,
+                'publication_link': publication_link if publication_link.startswith('https://') else f"https://issuu.com/{publication_link}"
+            })
+    return results
+
+# Shared across scrapes so repeat queries reuse pooled keep-alive connections
+_http_client = None
+_http_client_loop = None
+
+def get_http_client():
+    # The pool is tied to the event loop it was created on, so a new loop gets a new client
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            headers={"User-Agent": USER_AGENT},
+            timeout=30,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30)
+        )
+        _http_client_loop = loop
+    return _http_client
+
+async def close_http_client():
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        _http_client_loop = None
+
+async def scrape_with_requests(company_name):
+    # Fetch the search page without a browser; returns None when the cards aren't in the static HTML
+    url = build_search_url(company_name)
     try:
-        async with async_playwright() as p:
-            # Launch browser
-            logger.info("Attempting to launch Chromium browser (headless=False)")
-            try:
-                browser = await p.chromium.launch(headless=False)  # Keep headless=False for debugging
-            except Exception as e:
-                logger.error(f"Failed to launch browser: {str(e)}")
-                raise
-            
-            logger.info("Browser launched successfully")
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
-            )
-            page = await context.new_page()
-            logger.info("New browser context and page created")
-            
-            # Log browser console messages
-            page.on("console", lambda msg: logger.debug(f"Browser console: {msg.text}"))
-            
+        logger.info(f"Fetching {url} without a browser")
+        response = await get_http_client().get(url)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.info(f"Static fetch failed: {str(e)}")
+        return None
+    
+    match = NEXT_DATA_PATTERN.search(response.text)
+    if match:
+        results = parse_next_data(match.group(1))
+        if results is not None:
+            logger.info(f"Extracted {len(results)} valid results from the page data")
+            return results
+    
+    results = parse_search_html(response.text)
+    if not results:
+        logger.info("No result cards found in the static HTML")
+        return None
+    logger.info(f"Extracted {len(results)} valid results from the static HTML")
+    return results
+
+def consent_cookie():
+    # Cookiebot's stored consent with every category accepted
+    value = (
+        "{stamp:'-1',necessary:true,preferences:true,statistics:true,marketing:true,"
+        f"ver:1,utc:{int(time.time() * 1000)},region:'us'}}"
+    )
+    return {"name": "CookieConsent", "value": value, "domain": ".issuu.com", "path": "/"}
+
+async def block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def scrape_with_playwright(browser, company_name):
+    url = build_search_url(company_name)
+    
+    # Each scrape gets its own context so concurrent companies don't share cookies or storage
+    context = await browser.new_context(user_agent=USER_AGENT)
+    
+    try:
+        await context.route("**/*", block_heavy_resources)
+        page = await context.new_page()
+        logger.info("New browser context and page created")
+        
+        # Log browser console messages
+        page.on("console", lambda msg: logger.debug(f"Browser console: {msg.text}"))
+        
+        # Accept cookies up front so Cookiebot never shows its consent dialog
+        await context.add_cookies([consent_cookie()])
+        
+        # Navigate to the URL
+        logger.info(f"Navigating to {url}")
+        await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        logger.info("Page navigation completed")
+        
+        # Prefer the embedded page data, which needs no waiting for the cards to render
+        next_data = await page.evaluate("() => document.getElementById('__NEXT_DATA__')?.textContent ?? null")
+        if next_data:
+            results = parse_next_data(next_data)
+            if results is not None:
+                logger.info(f"Extracted {len(results)} valid results from the page data")
+                return results
+        
+        # Wait for search results
+        cards = page.locator(CARD_SELECTOR)
+        logger.info(f"Waiting for search results with selector: {CARD_SELECTOR}")
+        await cards.first.wait_for(state='visible', timeout=30000)
+        logger.info("Search results loaded")
+        
+        # Scroll to load all results
+        logger.info("Scrolling to the bottom of the page to load all results")
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try:
+            await page.wait_for_function(CARD_COUNT_STABLE_JS, arg=CARD_SELECTOR, polling=200, timeout=3000)
+            logger.info("Scroll completed, result count is stable")
+        except PlaywrightTimeoutError:
+            logger.info("Scroll completed, result count still changing after 3s")
+        
+        # Extract data using JavaScript
+        logger.info("Extracting data from all <li> elements using JavaScript")
+        results = await cards.evaluate_all(EXTRACT_CARDS_JS, [TITLE_SELECTOR, AUTHOR_LINK_SELECTOR, PRICE_SELECTOR])
+        logger.info(f"Extracted {len(results)} valid results")
+        
+        return results
+    
+    except Exception as e:
+        logger.error(f"Error during scraping: {str(e)}")
+        return []
+    
+    finally:
+        logger.info("Closing browser context")
+        await context.close()
+
+def filter_results(company_name, results):
+    # Per-result lines are only built when debug logging is on
+    debug = logger.isEnabledFor(logging.DEBUG)
+    
+    # Filter duplicates based on title, keeping the first result seen for each
+    unique_by_title = {}
+    for result in results:
+        unique_by_title.setdefault(result['title'], result)
+    unique_results = list(unique_by_title.values())
+    if debug:
+        logger.debug(f"Skipped {len(results) - len(unique_results)} duplicate results")
+    
+    # Compare author_link with company_name
+    similarity_threshold = 0.8
+    if not unique_results:
+        logger.info(f"Processed 0 results: 0 matched, 0 unmatched (threshold={similarity_threshold})")
+        return [], []
+    
+    company_domain = company_name.lower().translate(DOMAIN_STRIP_TABLE)
+    df = pd.DataFrame(unique_results)
+    author_domains = (
+        df['author_link'].str.replace(ISSUU_URL, "", regex=False)
+        .str.lower()
+        .str.translate(DOMAIN_STRIP_TABLE)
+    )
+    
+    # Exact slugs are a match outright and pairs whose lengths rule out the threshold are skipped,
+    # so only the remaining candidates are actually scored. The ratio is 1 - distance / (len(a) + len(b))
+    # and the distance is at least the length difference, which gives the upper bound below.
+    similarities = np.zeros(len(df))
+    exact = (author_domains == company_domain).to_numpy()
+    similarities[exact] = 1.0
+    lengths = author_domains.str.len().to_numpy()
+    upper_bound = 1 - np.abs(lengths - len(company_domain)) / np.maximum(lengths + len(company_domain), 1)
+    candidates = ~exact & (upper_bound >= similarity_threshold)
+    if candidates.any():
+        # Score the candidates in a single call; scores below the cutoff come back as 0.
+        # The company is the only query, so its match index is built once and reused for every author
+        similarities[candidates] = process.cdist(
+            [company_domain], author_domains[candidates].tolist(),
+            scorer=fuzz.ratio, score_cutoff=similarity_threshold * 100
+        )[0] / 100.0
+    
+    mask = similarities >= similarity_threshold
+    if debug:
+        for title, similarity, matched in zip(df['title'], similarities, mask):
+            if matched:
+                logger.debug(f"Matched: {title} (Similarity: {similarity:.2f})")
+            else:
+                logger.debug(f"Non-matched: {title} (Similarity < {similarity_threshold:.2f})")
+    
+    matching_results = [Publication(**record) for record in df[mask].to_dict('records')]
+    non_matching_results = [Publication(**record) for record in df[~mask].to_dict('records')]
+    logger.info(
+        f"Processed {len(unique_results)} results: {len(matching_results)} matched, "
+        f"{len(non_matching_results)} unmatched (threshold={similarity_threshold})"
+    )
+    return matching_results, non_matching_results
+
+async def scrape_issuu_results(company_name, browser=None, browser_factory=None):
+    # Try the plain HTTP fetch first and only fall back to a browser when the cards aren't server-rendered.
+    # browser_factory is awaited for a browser on the first fallback, so callers needn't launch one up front
+    results = await scrape_with_requests(company_name)
+    if results is None:
+        logger.info("Falling back to Playwright")
+        if browser is None and browser_factory is not None:
+            browser = await browser_factory()
+        if browser is not None:
+            results = await scrape_with_playwright(browser, company_name)
+        else:
+            # No browser from the caller, so launch one just for this company; a failed launch is raised
+            # rather than reported as no results
+            playwright, browser = await init_playwright()
             try:
-                # Navigate to the URL
-                logger.info(f"Navigating to {url}")
-                await page.goto(url, timeout=60000, wait_until="domcontentloaded")
-                logger.info("Page navigation completed")
-                
-                # Handle cookie consent popup
-                logger.info("Checking for cookie consent popup")
+                results = await scrape_with_playwright(browser, company_name)
+            finally:
+                await close_playwright(playwright, browser)
+    
+    return filter_results(company_name, results)
+
+async def scrape_issuu_batch(company_names, max_concurrency=5, browser=None, browser_factory=None, progress_callback=None, semaphore=None, result_callback=None):
+    # Fan the companies out across contexts of one browser. Without a browser or browser_factory from the caller,
+    # one is launched on the first Playwright fallback and closed at the end. Results keep the input order, with
+    # exceptions in place of failed companies (a failed launch included); progress_callback(done, total)
+    # and result_callback(company_name, res) are called as each company finishes. Pass a semaphore to share
+    # one concurrency limit across batches.
+    playwright = None
+    launch_lock = asyncio.Lock()
+    launch_error = None
+    
+    async def _launch_once():
+        nonlocal playwright, browser, launch_error
+        async with launch_lock:
+            if browser is None:
+                # Don't retry a launch that already failed for every remaining company
+                if launch_error is not None:
+                    raise launch_error
                 try:
-                    cookie_button = page.locator('//*[@id="CybotCookiebotDialogBodyButtonAccept"]')
-                    logger.info("Waiting for cookie 'Accept' button (7s timeout)")
-                    await cookie_button.wait_for(state='visible', timeout=7000)
-                    logger.info("Clicking 'Accept' button for cookies")
-                    await cookie_button.click()
-                    logger.info("Waiting for cookie popup to disappear")
-                    await page.wait_for_selector('#CybotCookiebotDialog', state='hidden', timeout=10000)
-                    logger.info("Cookie popup dismissed successfully")
+                    playwright, browser = await init_playwright()
                 except Exception as e:
-                    logger.info(f"No cookie popup detected or failed to dismiss: {str(e)}")
-                
-                # Wait for search results
-                price_selector = '.PublicationCard__publication-card__price__SATkI__0-0-3199'
-                results_selector = f'li:has({price_selector})'
-                logger.info(f"Waiting for search results with selector: {results_selector}")
-                await page.wait_for_selector(results_selector, state='visible', timeout=30000)
-                logger.info("Search results loaded")
-                
-                # Scroll to load all results
-                logger.info("Scrolling to the bottom of the page to load all results")
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_timeout(1000)  # 1s wait for dynamic content
-                logger.info("Scroll completed, waited 1s for dynamic content")
-                
-                # Extract data using JavaScript
-                logger.info("Extracting data from all <li> elements using JavaScript")
-                results = await page.evaluate("""
-                    () => {
-                        const items = document.querySelectorAll('li:has(.PublicationCard__publication-card__price__SATkI__0-0-3199)');
-                        const data = [];
-                        items.forEach(item => {
-                            const titleElement = item.querySelector('h3.PublicationCard__publication-card__card-title__jufAN__0-0-3199');
-                            const title = titleElement?.innerText.trim();
-                            const authorLink = item.querySelector('a.PublicationCard__publication-card__author-link__-bT0k__0-0-3199')?.getAttribute('href');
-                            const price = item.querySelector('.PublicationCard__publication-card__price__SATkI__0-0-3199')?.innerText.trim();
-                            const publicationLinkElement = titleElement?.closest('a') || item.querySelector('a:has(h3.PublicationCard__publication-card__card-title__jufAN__0-0-3199)');
-                            const publicationLink = publicationLinkElement?.getAttribute('href');
-                            if (title && authorLink && price && publicationLink) {
-                                data.push({
-                                    title,
-                                    author_link: `https://issuu.com/${authorLink}`,
-                                    price,
-                                    publication_link: publicationLink.startsWith('https://') ? publicationLink : `https://issuu.com/${publicationLink}`
-                                });
-                            }
-                        });
-                        return data;
-                    }
-                """)
-                logger.info(f"Extracted {len(results)} valid results")
-                
-                # Filter duplicates based on title
-                seen_titles = set()
-                unique_results = []
-                for result in results:
-                    if result['title'] not in seen_titles:
-                        seen_titles.add(result['title'])
-                        unique_results.append(result)
-                        logger.info(f"Added unique result: {result['title']}")
-                    else:
-                        logger.info(f"Skipped duplicate result: {result['title']}")
-                
-                # Compare author_link with company_name
-                matching_results = []
-                non_matching_results = []
-                similarity_threshold = 0.8
-                company_domain = company_name.lower().replace(" ", "").replace(".", "")
-                for result in unique_results:
-                    author_domain = result['author_link'].replace("https://issuu.com/", "").lower().replace(" ", "").replace(".", "")
-                    similarity = calculate_similarity(company_domain, author_domain)
-                    if similarity >= similarity_threshold:
-                        matching_results.append(result)
-                        logger.info(f"Matched: {result['title']} (Similarity: {similarity:.2f})")
-                    else:
-                        non_matching_results.append(result)
-                        logger.info(f"Non-matched: {result['title']} (Similarity: {similarity:.2f})")
-                
-                logger.info(f"Scraping completed. {len(matching_results)} matching, {len(non_matching_results)} non-matching results")
-                return matching_results, non_matching_results
-            
+                    launch_error = e
+                    raise
+            return browser
+    
+    if browser is None and browser_factory is None:
+        browser_factory = _launch_once
+    
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def _one(index, company_name):
+        async with semaphore:
+            try:
+                return index, await scrape_issuu_results(company_name, browser, browser_factory)
             except Exception as e:
-                logger.error(f"Error during scraping: {str(e)}")
-                return [], []
-            
-            finally:
-                logger.info("Closing browser")
-                await browser.close()
+                return index, e
     
-    except Exception as e:
-        logger.error(f"Failed to initialize Playwright: {str(e)}")
-        return [], []
+    tasks = [asyncio.create_task(_one(i, name)) for i, name in enumerate(company_names)]
+    results = [None] * len(company_names)
+    try:
+        logger.info(f"Scraping {len(company_names)} companies with up to {max_concurrency} concurrent contexts")
+        for done, future in enumerate(asyncio.as_completed(tasks), 1):
+            index, res = await future
+            results[index] = res
+            if result_callback is not None:
+                result_callback(company_names[index], res)
+            if progress_callback is not None:
+                progress_callback(done, len(company_names))
+        return results
+    finally:
+        # Don't leave scrapes running against a browser that's about to close
+        for task in tasks:
+            task.cancel()
+        if playwright is not None:
+            await close_playwright(playwright, browser)
+
+async def run_and_close(coro):
+    # Close the shared HTTP client on the loop that owns it before that loop shuts down
+    try:
+        return await coro
+    finally:
+        await close_http_client()
 
 if __name__ == "__main__":
     import sys
     logger.info("Starting the scraping process")
     if len(sys.argv) < 2:
-        logger.error("No company name provided. Usage: python issue_scraper.py <company_name>")
+        logger.error("No company name provided. Usage: python issue_scraper.py <company_name> [<company_name> ...]")
         sys.exit(1)
     
-    company_name = sys.argv[1]
-    logger.info(f"Scraping for company: {company_name}")
-    matching_results, non_matching_results = asyncio.run(scrape_issuu_results(company_name))
-    logger.info("Printing scraped results as JSON")
-    print("Matching Results:")
-    print(json.dumps(matching_results, indent=2, ensure_ascii=False))
-    print("Non-Matching Results:")
-    print(json.dumps(non_matching_results, indent=2, ensure_ascii=False))
-    logger.info("Scraping process finished")
+    if len(sys.argv) == 2:
+        company_name = sys.argv[1]
+        logger.info(f"Scraping for company: {company_name}")
+        matching_results, non_matching_results = asyncio.run(run_and_close(scrape_issuu_results(company_name)))
+        logger.info("Printing scraped results as JSON")
+        print("Matching Results:")
+        print(json.dumps(matching_results, indent=2, ensure_ascii=False, default=asdict))
+        print("Non-Matching Results:")
+        print(json.dumps(non_matching_results, indent=2, ensure_ascii=False, default=asdict))
+    else:
+        company_names = sys.argv[1:]
+        logger.info(f"Scraping for {len(company_names)} companies")
+        batch_results = asyncio.run(run_and_close(scrape_issuu_batch(company_names)))
+        logger.info("Printing scraped results as JSON")
+        for company_name, res in zip(company_names, batch_results):
+            if isinstance(res, Exception):
+                logger.error(f"Error scraping {company_name}: {str(res)}")
+                continue
+            matching_results, non_matching_results = res
+            print(f"Matching Results for {company_name}:")
+            print(json.dumps(matching_results, indent=2, ensure_ascii=False, default=asdict))
+            print(f"Non-Matching Results for {company_name}:")
+            print(json.dumps(non_matching_results, indent=2, ensure_ascii=False, default=asdict))
+    logger.info("Scraping process finished")
\ No newline at end of file
@@ -1,38 +1,153 @@
 import streamlit as st
-import json
+import orjson
+import io
 import asyncio
 import logging
 import platform
 import pandas as pd
 import subprocess
-from issue_scraper import scrape_issuu_results
+import os
+import tempfile
+import pathlib
+import threading
+import queue
+import atexit
+import time
+import sys
+import inspect
+import types
+
+# --- Cheaper stack capture for Playwright API calls ---
+# Playwright calls inspect.stack() on every API call and on every route.abort()/continue_(),
+# which reads the source of every frame.
+# The frames alone are enough for its API names, so skip the source lookup unless PW_NO_STACK=0.
+if os.environ.get("PW_NO_STACK", "1") != "0":
+    import playwright._impl._connection as pw_connection
+    import playwright._impl._network as pw_network
+
+    def _stack_without_source(context=1):
+        frame = sys._getframe(1)
+        frames = []
+        while frame is not None:
+            frames.append(inspect.FrameInfo(frame, frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name, None, None))
+            frame = frame.f_back
+        return frames
+
+    pw_connection.inspect = pw_network.inspect = types.SimpleNamespace(stack=_stack_without_source, FrameInfo=inspect.FrameInfo)
+
+from issue_scraper import init_playwright, close_playwright, close_http_client, scrape_issuu_batch
 
 # --- Streamlit must start with set_page_config ---
 st.set_page_config(page_title="Issuu Scraper", page_icon="📄", layout="wide")
 
 # --- Ensure Chromium is installed for Playwright ---
+# Marks a finished install so later worker processes don't shell out again
+PLAYWRIGHT_SENTINEL = os.path.join(tempfile.gettempdir(), ".pw_installed")
+
+def chromium_installed():
+    # Look for the Chromium binary in Playwright's browser cache for this platform
+    if os.environ.get("PLAYWRIGHT_BROWSERS_PATH") not in (None, "", "0"):
+        cache_dir = pathlib.Path(os.environ["PLAYWRIGHT_BROWSERS_PATH"])
+    elif platform.system() == "Windows":
+        cache_dir = pathlib.Path(os.environ.get("LOCALAPPDATA", "~/AppData/Local")).expanduser() / "ms-playwright"
+    elif platform.system() == "Darwin":
+        cache_dir = pathlib.Path("~/Library/Caches/ms-playwright").expanduser()
+    else:
+        cache_dir = pathlib.Path("~/.cache/ms-playwright").expanduser()
+    binaries = ("chrome-linux/chrome", "chrome-win/chrome.exe", "chrome-mac/Chromium.app")
+    return any(any(cache_dir.glob(f"chromium-*/{binary}")) for binary in binaries)
+
 @st.cache_resource
 def install_playwright():
+    if os.path.exists(PLAYWRIGHT_SENTINEL) or chromium_installed():
+        return
     try:
-        subprocess.run(["playwright", "install", "chromium"], check=True)
+        proc = subprocess.Popen(["playwright", "install", "chromium"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            proc.wait(timeout=120)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        open(PLAYWRIGHT_SENTINEL, "w").close()
     except Exception as e:
         # ⚠️ Don't use st.error here (it breaks the "first command" rule)
         print(f"❌ Failed to install Playwright Chromium: {e}")
 
 install_playwright()
 
-# Configure logging for Streamlit
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
-# Set WindowsProactorEventLoopPolicy for Windows
-if platform.system() == "Windows":
-    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-    logger.info("Applied WindowsProactorEventLoopPolicy for asyncio compatibility")
+# Logging and the event loop policy are process-wide, so set them up once instead of on every rerun
+@st.cache_resource
+def bootstrap():
+    # Configure logging for Streamlit
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    # Set WindowsProactorEventLoopPolicy for Windows
+    if platform.system() == "Windows":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        logger.info("Applied WindowsProactorEventLoopPolicy for asyncio compatibility")
+
+bootstrap()
+
+# --- Keep one event loop and a warm browser alive across reruns ---
+@st.cache_resource
+def get_event_loop():
+    # Playwright objects and the shared HTTP client are bound to the loop that created them,
+    # so every scrape runs on this one, in a background thread shared by all sessions
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="scraper-event-loop", daemon=True).start()
+    atexit.register(lambda: run_async(close_http_client(), timeout=10))
+    return loop
+
+def submit_async(coro):
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+def run_async(coro, timeout=None):
+    return submit_async(coro).result(timeout=timeout)
+
+MAX_CONCURRENCY = 5
+
+@st.cache_resource
+def get_scrape_semaphore():
+    # One limit for every session, so concurrent scrapes don't open more contexts on the shared browser
+    async def new_semaphore():
+        return asyncio.Semaphore(MAX_CONCURRENCY)
+    return run_async(new_semaphore())
+
+@st.cache_resource
+def get_browser_slot():
+    # Holds the current (playwright, browser) pair, replaced in place when the browser disconnects.
+    # Only touched on the loop thread, where the browser is launched on the first Playwright fallback
+    slot = {"pair": None, "lock": asyncio.Lock()}
+
+    def close_browser():
+        if slot["pair"] is not None:
+            run_async(close_playwright(*slot["pair"]), timeout=10)
+
+    atexit.register(close_browser)
+    return slot
+
+async def get_connected_browser(slot):
+    async with slot["lock"]:
+        if slot["pair"] is not None:
+            if slot["pair"][1].is_connected():
+                return slot["pair"][1]
+            logger.warning("Cached browser disconnected, launching a new one")
+            # Stop the old driver too, or each disconnect leaks a Playwright process
+            old_pair, slot["pair"] = slot["pair"], None
+            try:
+                await close_playwright(*old_pair)
+            except Exception as e:
+                logger.warning(f"Failed to close disconnected browser: {str(e)}")
+        slot["pair"] = await init_playwright()
+        return slot["pair"][1]
 
 # Title and description
 st.title("Issuu Publication Scraper")
@@ -41,121 +156,230 @@ st.markdown("Upload a CSV file containing company names. The scraper will run 5
 # File uploader for CSV
 uploaded_file = st.file_uploader("Upload CSV file", type=["csv"])
 
-# Helper to process batches of company names with concurrency=5
-async def process_companies(companies, batch_size=5):
-    results = []
-
-    for i in range(0, len(companies), batch_size):
-        batch = companies[i:i+batch_size]
-        logger.info(f"Processing batch {i//batch_size + 1} with {len(batch)} companies")
-        tasks = [scrape_issuu_results(company) for company in batch]
-        batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for company, res in zip(batch, batch_results):
-            if isinstance(res, Exception):
-                logger.error(f"Error scraping {company}: {str(res)}")
-                results.append({
-                    "company": company,
-                    "matching_results": [],
-                    "non_matching_results": [],
-                    "error": str(res)
-                })
-            else:
-                matching, non_matching = res
-                results.append({
-                    "company": company,
-                    "matching_results": matching,
-                    "non_matching_results": non_matching,
-                    "error": None
-                })
-
-    return results
+def to_company_result(company, res):
+    if isinstance(res, Exception):
+        logger.error(f"Error scraping {company}: {str(res)}")
+        return {
+            "company": company,
+            "matching_results": [],
+            "non_matching_results": [],
+            "error": str(res)
+        }
+    matching, non_matching = res
+    return {
+        "company": company,
+        "matching_results": matching,
+        "non_matching_results": non_matching,
+        "error": None
+    }
+
+RESULT_COLUMNS = ["company", "title", "author_link", "price", "publication_link", "match_type", "error"]
+
+# One row per publication (or a single error row), in RESULT_COLUMNS order
+def result_rows(res):
+    company = res["company"]
+    if res["error"]:
+        return [(company, None, None, None, None, "Error", res["error"])]
+    return [
+        (company, item.title, item.author_link, item.price, item.publication_link, match_type, None)
+        for match_type, items in (("Matching", res["matching_results"]), ("Non-Matching", res["non_matching_results"]))
+        for item in items
+    ]
+
+# Scraped results are reused for a day, across reruns and sessions in this process
+SCRAPE_CACHE_TTL = 24 * 60 * 60
+
+@st.cache_resource
+def get_scrape_cache():
+    # company -> (scraped_at, (matching, non_matching))
+    return {}
+
+@st.cache_resource
+def get_inflight_scrapes():
+    # company -> future resolved with its result, for scrapes still running in any session
+    return {}
+
+# Scrapes the companies no other session is scraping and waits on the rest, so concurrent sessions
+# never scrape the same company twice. Runs on the loop thread, which is the only one touching cache and inflight.
+async def scrape_or_join(companies, browser_factory, cache, inflight, max_concurrency, semaphore, on_result):
+    to_join = {company: inflight[company] for company in companies if company in inflight}
+    to_scrape = [company for company in companies if company not in to_join]
+    loop = asyncio.get_running_loop()
+    claimed = {company: loop.create_future() for company in to_scrape}
+    inflight.update(claimed)
+
+    def record(company, res):
+        # Cache each company as it finishes so an interrupted batch keeps what's done.
+        # Failed scrapes come back empty too, so only cache results that found something
+        if not isinstance(res, Exception) and any(res):
+            cache[company] = (time.time(), res)
+        inflight.pop(company, None)
+        claimed[company].set_result(res)
+        on_result(company, res)
+
+    async def join(company, future):
+        await asyncio.wait([future])
+        if future.cancelled():
+            # The session scraping it was interrupted, so take the company over
+            await scrape_or_join([company], browser_factory, cache, inflight, max_concurrency, semaphore, on_result)
+        else:
+            on_result(company, future.result())
+
+    try:
+        await asyncio.gather(
+            scrape_issuu_batch(
+                to_scrape, max_concurrency=max_concurrency, browser_factory=browser_factory,
+                semaphore=semaphore, result_callback=record
+            ),
+            *(join(company, future) for company, future in to_join.items())
+        )
+    finally:
+        # Hand unfinished companies over to any session waiting on them
+        for company, future in claimed.items():
+            if not future.done():
+                if inflight.get(company) is future:
+                    del inflight[company]
+                future.cancel()
+
+# Helper to scrape all company names with concurrency=5; a new company starts as soon as any slot frees up.
+# Companies scraped within SCRAPE_CACHE_TTL are served from the cache instead.
+async def process_companies(companies, browser_factory, cache, inflight, max_concurrency=5, progress_callback=None, semaphore=None):
+    now = time.time()
+    # Drop expired entries so the process-wide cache doesn't keep growing
+    for company in [company for company, entry in cache.items() if now - entry[0] >= SCRAPE_CACHE_TTL]:
+        del cache[company]
+    company_results = {company: cache[company][1] for company in companies if company in cache}
+    to_scrape = [company for company in companies if company not in company_results]
+    logger.info(f"Processing {len(companies)} companies: {len(company_results)} cached, scraping {len(to_scrape)} with up to {max_concurrency} at a time")
+
+    scraped = 0
+
+    def on_result(company, res):
+        nonlocal scraped
+        company_results[company] = res
+        scraped += 1
+        if progress_callback is not None:
+            progress_callback(scraped, len(to_scrape))
+
+    await scrape_or_join(to_scrape, browser_factory, cache, inflight, max_concurrency, semaphore, on_result)
+
+    return [to_company_result(company, company_results[company]) for company in companies]
+
+# Raised by the pyarrow CSV reader; pandas usually wraps it in a ParserError
+try:
+    from pyarrow import ArrowInvalid
+except ImportError:
+    ArrowInvalid = pd.errors.ParserError
+
+# Keyed on the uploaded bytes so reruns don't parse the same CSV again; None if the column is missing
+@st.cache_data(show_spinner=False)
+def load_companies(file_bytes):
+    # Read just the header first so only the company_name column gets parsed
+    if "company_name" not in pd.read_csv(io.BytesIO(file_bytes), nrows=0).columns:
+        return None
+    try:
+        df = pd.read_csv(io.BytesIO(file_bytes), engine="pyarrow", dtype_backend="pyarrow", usecols=["company_name"])
+        # Keep the Arrow storage; all-numeric columns come back as Arrow ints, so cast those to strings too
+        names = df["company_name"].dropna().astype("string[pyarrow]")
+    except (ImportError, pd.errors.ParserError, ArrowInvalid):
+        # pyarrow isn't installed, or rejected rows the C parser accepts (e.g. ragged rows
+        # from exports that drop empty trailing cells), so use the default C parser
+        df = pd.read_csv(io.BytesIO(file_bytes), usecols=["company_name"])
+        names = df["company_name"].dropna().astype("string")
+    # Trim and collapse whitespace, drop blanks, and keep the first spelling of case-insensitive duplicates
+    names = names.str.strip().str.replace(r"\s+", " ", regex=True)
+    names = names[names.str.len() > 0]
+    return names[~names.str.casefold().duplicated()].tolist()
+
+# Draws the stored results; runs on every rerun without scraping again
+def render_results(scrape):
+    results_df = scrape["results_df"]
+    all_results = scrape["all_results"]
+    if not results_df.empty:
+        # Links are rendered client-side from the raw URLs
+        st.subheader("Scraped Results")
+        st.caption(f"Scraped at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scrape['scraped_at']))}")
+        st.dataframe(
+            results_df,
+            column_order=['company', 'title', 'publication_link', 'author_link', 'price', 'match_type'],
+            column_config={
+                'company': "Company",
+                'title': "Title",
+                'publication_link': st.column_config.LinkColumn("Publication", display_text="Open publication"),
+                'author_link': st.column_config.LinkColumn("Author", display_text=r"https://issuu\.com/(.*)"),
+                'price': "Price",
+                'match_type': "Match Type"
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+
+        # JSON download button; the payload is serialised on the first render and reused on later reruns
+        if "json_data" not in scrape:
+            scrape["json_data"] = orjson.dumps(all_results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        st.download_button(
+            label="Download All Results as JSON",
+            data=scrape["json_data"],
+            file_name="issuu_results.json",
+            mime="application/json",
+            key="download_button"
+        )
+    else:
+        st.warning("No results found.")
 
 # Process file on button click
 if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
+    company_names = load_companies(uploaded_file.getvalue())
 
-    if "company_name" not in df.columns:
+    if company_names is None:
         st.error("CSV must contain a 'company_name' column.")
     else:
-        company_names = df["company_name"].dropna().unique().tolist()
-
         if st.button("Scrape Companies", key="scrape_button"):
             st.info(f"Found {len(company_names)} companies to scrape")
             with st.spinner("Scraping Issuu... This may take a while."):
                 try:
-                    all_results = asyncio.run(process_companies(company_names, batch_size=5))
+                    browser_slot = get_browser_slot()
+                    progress = st.progress(0.0, text="Starting scrape...")
+                    updates = queue.SimpleQueue()
+                    future = submit_async(process_companies(
+                        company_names, lambda: get_connected_browser(browser_slot), get_scrape_cache(), get_inflight_scrapes(),
+                        max_concurrency=MAX_CONCURRENCY,
+                        progress_callback=lambda done, total: updates.put((done, total)),
+                        semaphore=get_scrape_semaphore()
+                    ))
+                    try:
+                        # The scrape runs on the loop thread, but widgets can only be updated from this one
+                        while not future.done():
+                            try:
+                                done, total = updates.get(timeout=0.2)
+                            except queue.Empty:
+                                continue
+                            progress.progress(done / total, text=f"Scraped {done}/{total} companies")
+                        all_results = future.result()
+                    finally:
+                        # A rerun or stop interrupts this wait; don't leave the scrape running without a page to show it
+                        future.cancel()
+                    progress.empty()
 
                     # Flatten results into a DataFrame for display
-                    rows = []
-                    for res in all_results:
-                        company = res["company"]
-                        if res["error"]:
-                            rows.append({
-                                "company": company,
-                                "title": None,
-                                "author_link": None,
-                                "price": None,
-                                "publication_link": None,
-                                "match_type": "Error",
-                                "error": res["error"]
-                            })
-                        else:
-                            for item in res["matching_results"]:
-                                rows.append({
-                                    "company": company,
-                                    "title": item["title"],
-                                    "author_link": item["author_link"],
-                                    "price": item["price"],
-                                    "publication_link": item["publication_link"],
-                                    "match_type": "Matching",
-                                    "error": None
-                                })
-                            for item in res["non_matching_results"]:
-                                rows.append({
-                                    "company": company,
-                                    "title": item["title"],
-                                    "author_link": item["author_link"],
-                                    "price": item["price"],
-                                    "publication_link": item["publication_link"],
-                                    "match_type": "Non-Matching",
-                                    "error": None
-                                })
-
-                    results_df = pd.DataFrame(rows)
-
-                    if not results_df.empty:
-                        # Make links clickable
-                        results_df['title'] = results_df.apply(
-                            lambda row: f'<a href="{row["publication_link"]}" target="_blank">{row["title"]}</a>'
-                            if row["publication_link"] else row["title"], axis=1
-                        )
-                        results_df['author_link'] = results_df['author_link'].apply(
-                            lambda x: f'<a href="{x}" target="_blank">{x}</a>' if pd.notnull(x) else x
-                        )
-
-                        st.subheader("Scraped Results")
-                        st.markdown(
-                            results_df[['company', 'title', 'author_link', 'price', 'match_type']]
-                            .to_html(escape=False, index=False),
-                            unsafe_allow_html=True
-                        )
-
-                        # JSON download button
-                        json_data = json.dumps(all_results, indent=2, ensure_ascii=False)
-                        st.download_button(
-                            label="Download All Results as JSON",
-                            data=json_data,
-                            file_name="issuu_results.json",
-                            mime="application/json",
-                            key="download_button"
-                        )
-                    else:
-                        st.warning("No results found.")
+                    rows = [row for res in all_results for row in result_rows(res)]
+                    results_df = pd.DataFrame.from_records(rows, columns=RESULT_COLUMNS)
+
+                    st.session_state["scrape"] = {
+                        "companies": company_names,
+                        "all_results": all_results,
+                        "results_df": results_df,
+                        "scraped_at": time.time()
+                    }
                 except Exception as e:
                     logger.error(f"Error during scraping in Streamlit: {str(e)}")
                     st.error(f"Error during scraping: {str(e)}")
 
+        # Only show results that belong to the companies in the current upload
+        scrape = st.session_state.get("scrape")
+        if scrape is not None and scrape["companies"] == company_names:
+            render_results(scrape)
+
 # Footer
 st.markdown("---")
 st.markdown("Built with Streamlit, Playwright & AsyncIO. 🚀")